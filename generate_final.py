@@ -1,34 +1,117 @@
+import glob
 import os
 import shutil
+import tempfile
 import textwrap
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_cleanup_threads = []
+_print_lock = threading.Lock()
 
 # --- UTILS ---
-def create_file(path, content):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w") as f:
-        f.write(content.strip())
-    print(f"✅ Generated: {path}")
+def log(*lines):
+    """Prints lines as one block so output from parallel setups and cleanups doesn't interleave."""
+    with _print_lock:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+def create_file(path, content, messages=None, mode=0o644):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        view = memoryview(content)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    message = f"✅ Generated: {path}"
+    if messages is None:
+        log(message)
+    else:
+        messages.append(message)
+
+def make_dirs(paths):
+    """Creates each parent directory of the given paths once, one depth level at a time."""
+    dirs = set()
+    for path in paths:
+        parent = os.path.dirname(path)
+        while parent and parent not in dirs:
+            dirs.add(parent)
+            parent = os.path.dirname(parent)
+    # Siblings share a level; every parent is created before its children.
+    for d in sorted(dirs, key=lambda d: d.count(os.sep)):
+        try:
+            os.mkdir(d)
+        except FileExistsError:
+            pass
+
+def write_files(files, header=None):
+    """Writes a project's (path, bytes, mode) entries: all directories first, then all files.
+
+    The optional header is logged in the same block as the per-file messages, so
+    projects generated in parallel keep their output together.
+    """
+    make_dirs(path for path, _, _ in files)
+    messages = [] if header is None else [header]
+    for path, content, mode in files:
+        create_file(path, content, messages, mode)
+    log(*messages)
 
 def clean_directory(path):
-    """Safely removes a directory, handling permission errors from previous sudo runs."""
+    """Safely removes a directory, handling permission errors from previous sudo runs.
+
+    The old tree is renamed to a hidden ".<name>.trash-*" directory and deleted in a
+    background thread, so the new project can be generated while it is being removed.
+    Trash directories left behind by earlier runs (see _remove_tree) are retried as well;
+    nothing outside that prefix is ever touched.
+    """
+    parent = os.path.dirname(path) or "."
+    trash_prefix = f".{os.path.basename(path)}.trash-"
+    stale = [d for d in glob.glob(os.path.join(glob.escape(parent), glob.escape(trash_prefix) + "*"))
+             if os.path.isdir(d)]
     if os.path.exists(path):
+        trash = None
         try:
-            shutil.rmtree(path)
-        except PermissionError:
-            print(f"\n❌ ERROR: Permission denied while removing '{path}'.")
-            print("   REASON: The previous build was run with 'sudo', so the files are owned by Root.")
-            print(f"   FIX: Please run this command to clean up, then try again:")
-            print(f"        sudo rm -rf {path}\n")
-            sys.exit(1)
-
-def setup_spring_project():
-    base = "my-spring-app"
-    clean_directory(base)
-    print(f"\n🚀 Creating STATIC Spring Boot Project: {base}...")
-
-    # 1. POM.XML
-    pom = """
+            # mkdtemp guarantees a fresh name; the rename replaces the empty placeholder.
+            trash = os.path.normpath(tempfile.mkdtemp(prefix=trash_prefix, dir=parent))
+            os.rename(path, trash)
+        except OSError as e:
+            if trash is not None:
+                os.rmdir(trash)
+            log(f"\n❌ ERROR: Could not move old project '{path}' aside: {e.strerror}.",
+                f"   REASON: Replacing it needs write permission on '{os.path.abspath(parent)}'.",
+                "   FIX: Run the generator from a directory you can write to, then try again.\n")
+            raise RuntimeError(f"Could not move '{path}' aside") from e
+        stale.append(trash)
+    for old in stale:
+        thread = threading.Thread(target=_remove_tree, args=(old,), daemon=True)
+        thread.start()
+        _cleanup_threads.append(thread)
+
+def _remove_tree(path):
+    try:
+        shutil.rmtree(path)
+    except PermissionError:
+        log(f"\n⚠️  WARNING: Permission denied while removing old build '{path}'.",
+            "   REASON: The previous build was run with 'sudo', so the files are owned by Root.",
+            f"   FIX: Please run this command to clean up (the next run will also retry it):",
+            f"        sudo rm -rf {path}\n")
+    except OSError as e:
+        log(f"\n⚠️  WARNING: Could not remove old build '{path}': {e.strerror}.",
+            f"   FIX: Remove it by hand once it is no longer in use (the next run will also retry it):",
+            f"        rm -rf {path}\n")
+
+def wait_for_cleanup():
+    """Blocks until every background removal started by clean_directory is done."""
+    for thread in _cleanup_threads:
+        thread.join()
+
+# --- TEMPLATES ---
+# Shell scripts are dedented once at import instead of on every generator run.
+
+# Spring Boot: 1. POM.XML
+SPRING_POM_XML = """
 <project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
   xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 http://maven.apache.org/xsd/maven-4.0.0.xsd">
   <modelVersion>4.0.0</modelVersion>
@@ -47,15 +130,13 @@ def setup_spring_project():
   <build><plugins><plugin><groupId>org.springframework.boot</groupId><artifactId>spring-boot-maven-plugin</artifactId></plugin></plugins></build>
 </project>
 """
-    create_file(f"{base}/pom.xml", pom)
 
-    # 2. APPLICATION PROPERTIES (HARDCODED PORT 8080)
-    # This embeds the port into the JAR file. It cannot be changed easily after build.
-    props = "server.port=8080"
-    create_file(f"{base}/src/main/resources/application.properties", props)
+# Spring Boot: 2. APPLICATION PROPERTIES (HARDCODED PORT 8080)
+# This embeds the port into the JAR file. It cannot be changed easily after build.
+SPRING_APPLICATION_PROPERTIES = "server.port=8080"
 
-    # 3. Java Code
-    java = """
+# Spring Boot: 3. Java Code
+SPRING_APPLICATION_JAVA = """
 package com.company;
 import org.springframework.boot.SpringApplication;
 import org.springframework.boot.autoconfigure.SpringBootApplication;
@@ -74,10 +155,9 @@ public class Application {
     }
 }
 """
-    create_file(f"{base}/src/main/java/com/company/Application.java", java)
 
-    # 4. CONTROL SCRIPT
-    bash = textwrap.dedent("""
+# Spring Boot: 4. CONTROL SCRIPT
+SPRING_CONTROL_SH = textwrap.dedent("""
         #!/bin/bash
         # Port is NO LONGER a variable here. It is read from the JAR file.
         LOG_FILE="server.log"
@@ -107,10 +187,9 @@ public class Application {
             echo "FAILED. Check logs."
         fi
     """)
-    create_file(f"{base}/control.sh", bash)
 
-    # 5. SERVICE INSTALLER (UPDATED WITH AUTO-BUILD)
-    service = textwrap.dedent("""
+# Spring Boot: 5. SERVICE INSTALLER (UPDATED WITH AUTO-BUILD)
+SPRING_INSTALL_SERVICE_SH = textwrap.dedent("""
         #!/bin/bash
         SERVICE_NAME="my-spring-app"
         WORK_DIR=$(pwd)
@@ -162,15 +241,9 @@ EOF
         sudo systemctl start $SERVICE_NAME
         echo "✅ Service Installed. Port 8080 is locked."
     """)
-    create_file(f"{base}/install_service.sh", service)
-
-def setup_servlet_project():
-    base = "my-servlet-app"
-    clean_directory(base)
-    print(f"\n🚀 Creating STATIC Servlet Project: {base}...")
 
-    # 1. POM.XML (HARDCODED PORT 8081)
-    pom = """
+# Servlet: 1. POM.XML (HARDCODED PORT 8081)
+SERVLET_POM_XML = """
 <project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
   xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 http://maven.apache.org/maven-v4_0_0.xsd">
   <modelVersion>4.0.0</modelVersion>
@@ -188,10 +261,9 @@ def setup_servlet_project():
   </plugin></plugins></build>
 </project>
 """
-    create_file(f"{base}/pom.xml", pom)
 
-    # 2. Servlet Code
-    java = """
+# Servlet: 2. Servlet Code
+SERVLET_HELLO_JAVA = """
 package com.company;
 import javax.servlet.*;
 import javax.servlet.annotation.WebServlet;
@@ -204,10 +276,9 @@ public class HelloServlet extends HttpServlet {
     }
 }
 """
-    create_file(f"{base}/src/main/java/com/company/HelloServlet.java", java)
 
-    # 3. CONTROL SCRIPT
-    bash = textwrap.dedent("""
+# Servlet: 3. CONTROL SCRIPT
+SERVLET_CONTROL_SH = textwrap.dedent("""
         #!/bin/bash
         LOG_FILE="servlet.log"
         
@@ -227,11 +298,11 @@ public class HelloServlet extends HttpServlet {
             echo "FAILED. Check logs."
         fi
     """)
-    create_file(f"{base}/control.sh", bash)
-    create_file(f"{base}/src/main/webapp/WEB-INF/web.xml", '<web-app version="3.0" xmlns="http://java.sun.com/xml/ns/javaee"></web-app>')
 
-    # 4. SERVICE INSTALLER
-    service = textwrap.dedent("""
+SERVLET_WEB_XML = '<web-app version="3.0" xmlns="http://java.sun.com/xml/ns/javaee"></web-app>'
+
+# Servlet: 4. SERVICE INSTALLER
+SERVLET_INSTALL_SERVICE_SH = textwrap.dedent("""
         #!/bin/bash
         SERVICE_NAME="my-servlet-app"
         WORK_DIR=$(pwd)
@@ -262,11 +333,59 @@ EOF
         sudo systemctl start $SERVICE_NAME
         echo "✅ Service Installed. Port 8081 is locked."
     """)
-    create_file(f"{base}/install_service.sh", service)
+
+# --- ARTIFACTS ---
+# Each project's files as (path, bytes, mode), built once at import: the relative path is
+# joined to the project directory, the content is stripped and UTF-8 encoded, and shell
+# scripts get mode 0o755 so they can be run without a chmod first.
+SPRING_BASE = "my-spring-app"
+SERVLET_BASE = "my-servlet-app"
+
+def _artifacts(base, artifacts):
+    return [
+        (f"{base}/{rel_path}", content.strip().encode("utf-8"), 0o755 if rel_path.endswith(".sh") else 0o644)
+        for rel_path, content in artifacts
+    ]
+
+SPRING_ARTIFACTS = _artifacts(SPRING_BASE, [
+    ("pom.xml", SPRING_POM_XML),
+    ("src/main/resources/application.properties", SPRING_APPLICATION_PROPERTIES),
+    ("src/main/java/com/company/Application.java", SPRING_APPLICATION_JAVA),
+    ("control.sh", SPRING_CONTROL_SH),
+    ("install_service.sh", SPRING_INSTALL_SERVICE_SH),
+])
+
+SERVLET_ARTIFACTS = _artifacts(SERVLET_BASE, [
+    ("pom.xml", SERVLET_POM_XML),
+    ("src/main/java/com/company/HelloServlet.java", SERVLET_HELLO_JAVA),
+    ("control.sh", SERVLET_CONTROL_SH),
+    ("src/main/webapp/WEB-INF/web.xml", SERVLET_WEB_XML),
+    ("install_service.sh", SERVLET_INSTALL_SERVICE_SH),
+])
+
+# --- PROJECTS ---
+def setup_spring_project():
+    clean_directory(SPRING_BASE)
+    write_files(SPRING_ARTIFACTS, f"\n🚀 Creating STATIC Spring Boot Project: {SPRING_BASE}...")
+
+def setup_servlet_project():
+    clean_directory(SERVLET_BASE)
+    write_files(SERVLET_ARTIFACTS, f"\n🚀 Creating STATIC Servlet Project: {SERVLET_BASE}...")
 
 def main():
-    setup_spring_project()
-    setup_servlet_project()
+    try:
+        # The two projects live in separate directories, so they are generated side by side.
+        # Each worker cleans and writes only its own project, so a failure in one never
+        # leaves the other without its files.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(setup_spring_project), executor.submit(setup_servlet_project)]
+            for future in futures:
+                future.result()
+    except RuntimeError:
+        # clean_directory has already explained the problem to the user.
+        raise SystemExit(1)
+    finally:
+        wait_for_cleanup()
     print("\n✅ STATIC PORT PROJECTS GENERATED.")
     print("Go into folders and run: sudo ./install_service.sh")
 